@@ -1,120 +1,411 @@
 import streamlit as st
-import requests
-from bs4 import BeautifulSoup
+import asyncio
+import aiohttp
+from selectolax.lexbor import LexborHTMLParser
 import time
 import os
-from urllib.parse import urljoin, urlparse
-import json
+import re
+import hashlib
+from urllib.parse import urljoin, urlsplit, urlunsplit, unquote_plus
+import orjson
+from itertools import chain, islice
+from urllib.robotparser import RobotFileParser
 from datetime import datetime
 import zipfile
 from io import BytesIO
 
+try:
+    from aiohttp_client_cache import CachedSession, SQLiteBackend
+except ImportError:
+    CachedSession = None
+
+try:
+    # zlib-ng is a drop-in, SIMD-accelerated zlib; the archives it writes are ordinary deflate
+    from zlib_ng import zlib_ng
+    zipfile.zlib = zlib_ng
+except ImportError:
+    pass
+
 st.set_page_config(
     page_title="Close.com Documentation Scraper",
     page_icon="📚",
     layout="wide"
 )
 
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+# Number of pages fetched in parallel, and the pause each worker takes between requests
+MAX_CONCURRENCY = 8
+REQUEST_DELAY = 0.5
+
+# Transient server errors are retried with exponential backoff
+RETRY_STATUSES = {500, 502, 503, 504}
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.3
+
+# On-disk HTTP cache, so re-running a scrape does not re-download unchanged pages
+HTTP_CACHE_NAME = '.close_docs_cache'
+HTTP_CACHE_EXPIRE_AFTER = 86400
+
+# Pages are streamed in chunks and never buffered beyond this size
+MAX_PAGE_BYTES = 5_000_000
+READ_CHUNK_SIZE = 65536
+
+# Deflate levels for the download archive; low levels cost far less CPU for a slightly larger ZIP
+ZIP_COMPRESSLEVEL = 3
+ZIP_JSON_COMPRESSLEVEL = 1
+
+# Minimum seconds between Streamlit progress writes; each one is a round trip to the browser
+UI_UPDATE_INTERVAL = 0.2
+
+# Link filters, compiled once since they run against every <a> on every page
+_DOC_DOMAIN_RE = re.compile(r'https?://developer\.close\.com(?:[/?#]|$)')
+_FILE_EXT_RE = re.compile(r'\.(?:pdf|jpg|png|css|js|svg|ico)(?:[?#]|$)')
+_EXTERNAL_RE = re.compile(r'github\.com|twitter\.com|linkedin\.com|mailto:|tel:')
+
+# Query parameters that never change page content
+_TRACKING_PARAMS = frozenset({'gclid', 'fbclid', 'mc_cid', 'mc_eid'})
+
+def _is_tracking_param(key):
+    """Check if a query parameter name is tracking-only"""
+    return key in _TRACKING_PARAMS or key.startswith('utm_')
+
+def _canonicalize(url):
+    """Normalize a URL so fragment, tracking-query and trailing-slash variants compare equal"""
+    parts = urlsplit(url)
+    query = parts.query
+    if query:
+        # Filter the raw key=value segments so the parameters that are kept reach the
+        # server byte-for-byte; re-encoding them would change the URL that gets fetched
+        query = '&'.join(
+            param for param in query.split('&')
+            if not _is_tracking_param(unquote_plus(param.partition('=')[0]))
+        )
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, query, ''))
+
+# Define categories based on URL patterns and titles
+CATEGORIES = {
+    'API_Overview': ['introduction', 'getting-started', 'authentication', 'api-clients'],
+    'Resources': ['leads', 'contacts', 'opportunities', 'activities', 'tasks'],
+    'Advanced_Features': ['webhooks', 'custom-fields', 'reporting', 'bulk-actions'],
+    'Integration_Topics': ['rate-limits', 'errors', 'pagination', 'filtering'],
+    'Custom_Objects': ['custom-activities', 'custom-objects', 'custom-fields']
+}
+
+# One alternation per category, checked in order; the first match wins
+CATEGORY_RES = [
+    (category, re.compile('|'.join(map(re.escape, keywords))))
+    for category, keywords in CATEGORIES.items()
+]
+
+# Elements whose text is left out of the page content, and elements kept as code examples
+_SKIPPED_TAGS = frozenset({'script', 'style', 'nav', 'footer', 'header'})
+_CODE_TAGS = frozenset({'code', 'pre'})
+
+def _is_cacheable_page(response):
+    """Only cache HTML pages whose declared size is within MAX_PAGE_BYTES
+    
+    The cache reads the whole body before read_html() sees the response, so
+    anything it accepts bypasses the streaming size cap and the non-HTML skip.
+    Responses without a Content-Length (chunked) can't be checked up front and
+    are never cached.
+    """
+    return (
+        response.content_type == 'text/html'
+        and response.content_length is not None
+        and response.content_length <= MAX_PAGE_BYTES
+    )
+
+def _classify(url, title):
+    """Return the category a page belongs to, or None if no keyword matches"""
+    # The NUL separator keeps a keyword from matching across URL and title
+    haystack = url.lower() + '\0' + title.lower()
+    for category, pattern in CATEGORY_RES:
+        if pattern.search(haystack):
+            return category
+    return None
+
+_CODE_EXAMPLES_HEADING = "### Code Examples\n\n"
+_PAGE_SEPARATOR = "---\n\n"
+
+def _iter_page_chunks(contents):
+    """Yield the markdown for scraped pages piece by piece, for a single join per file"""
+    for content in contents:
+        yield f"## {content['title']}\n\n**URL:** {content['url']}\n\n"
+        # Page text and code are yielded as-is so they are copied only by the final join
+        yield content['content']
+        yield "\n\n"
+        
+        if content['code_examples']:
+            yield _CODE_EXAMPLES_HEADING
+            for code in content['code_examples']:
+                yield f"```{code.get('language', '')}\n"
+                yield code['content']
+                yield "\n```\n\n"
+        
+        yield _PAGE_SEPARATOR
+
 class CloseDocScraper:
-    def __init__(self):
+    def __init__(self, concurrency=MAX_CONCURRENCY):
         self.base_url = "https://developer.close.com"
         self.scraped_urls = set()
         self.scraped_content = {}
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+        self.content_fingerprints = {}
+        self.duplicate_urls = {}
+        self.robots_parsers = {}
+        self._parsed_cache = {}
+        self.concurrency = concurrency
+        self.session = None
+        self._last_ui_update = 0.0
+    
+    def _ui_update_due(self):
+        """Return True at most once per UI_UPDATE_INTERVAL"""
+        now = time.monotonic()
+        if now - self._last_ui_update < UI_UPDATE_INTERVAL:
+            return False
+        self._last_ui_update = now
+        return True
+    
+    def create_session(self, cached=True):
+        """Create the aiohttp session shared by all crawl workers"""
+        session_options = {
+            'headers': {'User-Agent': USER_AGENT},
+            'connector': aiohttp.TCPConnector(
+                limit=self.concurrency,
+                limit_per_host=self.concurrency,
+                keepalive_timeout=30,
+                ttl_dns_cache=300
+            ),
+            'timeout': aiohttp.ClientTimeout(total=10)
+        }
+        
+        if not cached or CachedSession is None:
+            return aiohttp.ClientSession(**session_options)
+        
+        cache = SQLiteBackend(
+            cache_name=HTTP_CACHE_NAME,
+            expire_after=HTTP_CACHE_EXPIRE_AFTER,
+            filter_fn=_is_cacheable_page
+        )
+        return CachedSession(cache=cache, **session_options)
+    
+    async def read_html(self, response):
+        """Stream an HTML body up to MAX_PAGE_BYTES, or return None for anything else"""
+        if response.content_type != 'text/html':
+            return None
+        if (response.content_length or 0) > MAX_PAGE_BYTES:
+            return None
+        
+        body = BytesIO()
+        async for chunk in response.content.iter_chunked(READ_CHUNK_SIZE):
+            body.write(chunk[:MAX_PAGE_BYTES - body.tell()])
+            if body.tell() >= MAX_PAGE_BYTES:
+                break
+        return body.getvalue()
+    
+    async def load_robots(self, url):
+        """Fetch and parse robots.txt for the host of a URL"""
+        parts = urlsplit(url)
+        robots_url = urlunsplit((parts.scheme, parts.netloc, '/robots.txt', '', ''))
+        parser = RobotFileParser(robots_url)
+        
+        # As in RobotFileParser.read(), 401/403 disallow everything and other 4xx allow
+        # everything. Server errors and network failures are retried like page fetches;
+        # if robots.txt still can't be read, nothing on the host is crawled.
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                async with self.session.get(robots_url) as response:
+                    if response.status in (401, 403):
+                        parser.disallow_all = True
+                        return parser
+                    if 400 <= response.status < 500:
+                        parser.allow_all = True
+                        return parser
+                    if response.status < 400:
+                        parser.parse((await response.text()).splitlines())
+                        return parser
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                pass
+            if attempt < MAX_RETRIES:
+                await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt)
+        
+        parser.disallow_all = True
+        return parser
+    
+    async def is_allowed_by_robots(self, url):
+        """Check robots.txt, fetching it once per host"""
+        host = urlsplit(url).netloc
+        if host not in self.robots_parsers:
+            self.robots_parsers[host] = await self.load_robots(url)
+        return self.robots_parsers[host].can_fetch(USER_AGENT, url)
+    
+    async def fetch(self, url):
+        """GET a URL on the shared session, retrying transient failures
         
-    def is_documentation_url(self, url):
+        Returns the status code, the final URL after redirects, the HTML body
+        (None if skipped) and whether the response came from the HTTP cache.
+        """
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                async with self.session.get(url) as response:
+                    if response.status not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                        response.raise_for_status()
+                        from_cache = getattr(response, 'from_cache', False)
+                        body = await self.read_html(response)
+                        return response.status, str(response.url), body, from_cache
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt == MAX_RETRIES:
+                    raise
+            await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt)
+        
+    @staticmethod
+    def is_documentation_url(url):
         """Check if URL is part of Close documentation"""
-        parsed = urlparse(url)
+        return (
+            _DOC_DOMAIN_RE.match(url) is not None
+            and not _FILE_EXT_RE.search(url)
+            and not _EXTERNAL_RE.search(url)
+        )
+    
+    def _parse_page(self, body):
+        """Parse a page into its title, cleaned text, code examples and unique link targets"""
+        tree = LexborHTMLParser(body)
+        
+        # Extract page title
+        title = tree.css_first('title')
+        title_text = title.text().strip() if title else None
+        
+        # Extract main content
+        main_content = tree.css_first('main') or tree.css_first('div.content') or tree.root
+        
+        # Clean text content and code examples
+        clean_content, code_examples = self._parse_content(main_content)
         
-        # More permissive URL filtering for debugging
-        is_close_domain = parsed.netloc == 'developer.close.com'
-        is_not_file = not any(url.endswith(ext) for ext in ['.pdf', '.jpg', '.png', '.css', '.js', '.svg', '.ico'])
-        is_not_external = not any(domain in url for domain in ['github.com', 'twitter.com', 'linkedin.com', 'mailto:', 'tel:'])
+        # Navigation repeats the same hrefs on a page, so keep each one once
+        hrefs = list(dict.fromkeys(link.attributes['href'] or '' for link in tree.css('a[href]')))
         
-        return is_close_domain and is_not_file and is_not_external
+        return title_text, clean_content, code_examples, hrefs
     
-    def clean_text(self, soup):
-        """Extract and clean text from BeautifulSoup object"""
-        # Remove script and style elements
-        for script in soup(["script", "style", "nav", "footer", "header"]):
-            script.decompose()
-        
-        # Get text and clean it up
-        text = soup.get_text()
-        lines = (line.strip() for line in text.splitlines())
+    def _parse_content(self, node):
+        """Extract cleaned text and code examples in a single walk of the DOM"""
+        texts = []
+        code_blocks = []
+        
+        # Depth-first walk; a (block, start) tuple marks the end of a code/pre element
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            
+            if isinstance(current, tuple):
+                block, start = current
+                block['content'] = ''.join(texts[start:]).strip()
+                continue
+            
+            tag = current.tag
+            if tag == '-text':
+                texts.append(current.text(deep=False))
+                continue
+            if tag in _SKIPPED_TAGS:
+                continue
+            
+            if tag in _CODE_TAGS:
+                classes = (current.attributes.get('class') or '').split()
+                block = {'type': tag, 'content': '', 'language': classes[0] if classes else ''}
+                code_blocks.append(block)
+                stack.append((block, len(texts)))
+            
+            children = []
+            child = current.child
+            while child is not None:
+                children.append(child)
+                child = child.next
+            stack.extend(reversed(children))
+        
+        # Clean up the text
+        lines = (line.strip() for line in ' '.join(texts).splitlines())
         chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
         text = ' '.join(chunk for chunk in chunks if chunk)
-        return text
-    
-    def extract_code_examples(self, soup):
-        """Extract code examples separately"""
-        code_blocks = []
-        for code in soup.find_all(['code', 'pre']):
-            if code.get_text().strip():
-                code_blocks.append({
-                    'type': code.name,
-                    'content': code.get_text().strip(),
-                    'language': code.get('class', [''])[0] if code.get('class') else ''
-                })
-        return code_blocks
+        
+        code_blocks = [block for block in code_blocks if block['content']]
+        return text, code_blocks
     
-    def scrape_page(self, url, progress_bar=None, status_text=None):
+    async def scrape_page(self, url, progress_bar=None, status_text=None):
         """Scrape a single page with Streamlit progress updates"""
         if url in self.scraped_urls:
             return []
         
         try:
-            if status_text:
+            if status_text and self._ui_update_due():
                 status_text.text(f"Scraping: {url}")
             
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extract page title
-            title = soup.find('title')
-            title_text = title.get_text().strip() if title else url.split('/')[-1]
-            
-            # Extract main content
-            main_content = soup.find('main') or soup.find('div', class_='content') or soup
-            
-            # Clean text content
-            clean_content = self.clean_text(main_content)
-            
-            # Extract code examples
-            code_examples = self.extract_code_examples(main_content)
-            
-            # Store scraped content
-            self.scraped_content[url] = {
-                'title': title_text,
-                'url': url,
-                'content': clean_content,
-                'code_examples': code_examples,
-                'scraped_at': datetime.now().isoformat()
-            }
+            if not await self.is_allowed_by_robots(url):
+                if status_text:
+                    status_text.text(f"Skipping page disallowed by robots.txt: {url}")
+                return []
+            
+            _, final_url, body, from_cache = await self.fetch(url)
+            if body is None:
+                if status_text:
+                    status_text.text(f"Skipping non-HTML or oversized page: {url}")
+                return []
+            
+            # Byte-identical bodies are only parsed once
+            body_hash = hashlib.sha1(body).digest()
+            parsed = self._parsed_cache.get(body_hash)
+            if parsed is None:
+                parsed = self._parsed_cache[body_hash] = self._parse_page(body)
+            
+            title, clean_content, code_examples, hrefs = parsed
+            title_text = title if title is not None else url.split('/')[-1]
+            
+            # Pages serving identical text are only stored once, under the lexicographically
+            # smallest URL so the result doesn't depend on which worker finished first.
+            # Pages with no text (e.g. rendered by JavaScript) are never treated as duplicates.
+            fingerprint = hashlib.sha1(clean_content.encode('utf-8', 'ignore')).digest() if clean_content else None
+            canonical_url = self.content_fingerprints.get(fingerprint)
+            
+            if canonical_url is not None and canonical_url < url:
+                self.duplicate_urls[url] = canonical_url
+            else:
+                if canonical_url is not None:
+                    # This URL sorts first, so it takes over from the page stored earlier
+                    del self.scraped_content[canonical_url]
+                    for alias, target in self.duplicate_urls.items():
+                        if target == canonical_url:
+                            self.duplicate_urls[alias] = url
+                    self.duplicate_urls[canonical_url] = url
+                if fingerprint is not None:
+                    self.content_fingerprints[fingerprint] = url
+                
+                # Store scraped content
+                self.scraped_content[url] = {
+                    'title': title_text,
+                    'url': url,
+                    'category': _classify(url, title_text),
+                    'content': clean_content,
+                    'code_examples': code_examples,
+                    'scraped_at': datetime.now().isoformat()
+                }
             
             self.scraped_urls.add(url)
             
-            # Find all links on this page - DEBUG VERSION
+            # Find all documentation links on this page. Relative hrefs resolve against the
+            # URL actually served (e.g. /docs/ after a redirect), not the canonical key
             links = []
-            all_links_found = []
             
-            for link in soup.find_all('a', href=True):
-                absolute_url = urljoin(url, link['href'])
-                all_links_found.append(absolute_url)
+            for href in hrefs:
+                absolute_url = _canonicalize(urljoin(final_url, href))
                 if self.is_documentation_url(absolute_url):
                     links.append(absolute_url)
             
             # Debug info for Streamlit
-            if status_text and url == self.base_url:
-                status_text.text(f"DEBUG: Found {len(all_links_found)} total links, {len(links)} documentation links on main page")
+            if status_text and url == _canonicalize(self.base_url):
+                status_text.text(f"DEBUG: Found {len(hrefs)} unique links, {len(links)} documentation links on main page")
             
-            # Small delay to be respectful
-            time.sleep(0.5)
+            # Small delay to be respectful; cached pages never reached the server
+            if not from_cache:
+                await asyncio.sleep(REQUEST_DELAY)
             
             return links
             
@@ -123,13 +414,14 @@ class CloseDocScraper:
                 status_text.text(f"Error scraping {url}: {str(e)}")
             return []
     
-    def crawl_documentation(self, start_url=None, progress_container=None):
-        """Crawl all documentation with Streamlit progress tracking"""
-        if not start_url:
-            start_url = self.base_url
+    async def crawl_documentation(self, start_url=None, progress_container=None):
+        """Crawl all documentation concurrently with Streamlit progress tracking"""
+        start_url = _canonicalize(start_url or self.base_url)
         
-        urls_to_visit = [start_url]
-        visited = set()
+        # asyncio.Queue pops from a deque; `queued` holds every URL ever enqueued
+        urls_to_visit = asyncio.Queue()
+        urls_to_visit.put_nowait(start_url)
+        queued = {start_url}
         
         if progress_container:
             progress_bar = progress_container.progress(0)
@@ -138,145 +430,164 @@ class CloseDocScraper:
             progress_bar = None
             status_text = None
         
-        while urls_to_visit:
-            current_url = urls_to_visit.pop(0)
-            
-            if current_url in visited:
-                continue
-                
-            visited.add(current_url)
-            new_links = self.scrape_page(current_url, progress_bar, status_text)
-            
-            # Add new links to visit
-            for link in new_links:
-                if link not in visited and link not in urls_to_visit:
-                    urls_to_visit.append(link)
-            
-            # Update progress
-            total_discovered = len(visited) + len(urls_to_visit)
-            progress = len(visited) / max(total_discovered, 1) if total_discovered > 0 else 1
-            
-            if progress_bar:
-                progress_bar.progress(min(progress, 1.0))
-            
-            if status_text:
-                status_text.text(f"Progress: {len(visited)} pages scraped, {len(urls_to_visit)} remaining")
+        async def worker():
+            while True:
+                current_url = await urls_to_visit.get()
+                try:
+                    new_links = await self.scrape_page(current_url, progress_bar, status_text)
+                    
+                    # Add new links to visit
+                    for link in new_links:
+                        if link not in queued:
+                            queued.add(link)
+                            urls_to_visit.put_nowait(link)
+                    
+                    # Update progress
+                    if self._ui_update_due():
+                        remaining = urls_to_visit.qsize()
+                        visited = len(queued) - remaining
+                        progress = visited / max(len(queued), 1)
+                        
+                        if progress_bar:
+                            progress_bar.progress(min(progress, 1.0))
+                        
+                        if status_text:
+                            status_text.text(f"Progress: {visited} pages scraped, {remaining} remaining")
+                finally:
+                    urls_to_visit.task_done()
+        
+        async with self.create_session() as self.session:
+            # The worker pool size caps how many requests are in flight at once
+            workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+            queue_drained = asyncio.create_task(urls_to_visit.join())
+            try:
+                # Workers only stop by raising (e.g. Streamlit's StopException); waiting on
+                # the join alone would then hang, so re-raise whatever ended a worker
+                done, _ = await asyncio.wait({queue_drained, *workers}, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task is not queue_drained:
+                        task.result()
+            finally:
+                for task in (queue_drained, *workers):
+                    task.cancel()
+                await asyncio.gather(queue_drained, *workers, return_exceptions=True)
+        
+        # Final update, which throttling may otherwise have skipped
+        if progress_bar:
+            progress_bar.progress(1.0)
+        
+        if status_text:
+            status_text.text(f"Progress: {len(queued)} pages scraped, 0 remaining")
     
     def create_organized_files(self):
         """Create organized documentation files and return as dict"""
         files = {}
         
-        # Define categories based on URL patterns and titles
-        categories = {
-            'API_Overview': ['introduction', 'getting-started', 'authentication', 'api-clients'],
-            'Resources': ['leads', 'contacts', 'opportunities', 'activities', 'tasks'],
-            'Advanced_Features': ['webhooks', 'custom-fields', 'reporting', 'bulk-actions'],
-            'Integration_Topics': ['rate-limits', 'errors', 'pagination', 'filtering'],
-            'Custom_Objects': ['custom-activities', 'custom-objects', 'custom-fields']
-        }
-        
         # Create category files
-        categorized_content = {cat: [] for cat in categories}
+        categorized_content = {cat: [] for cat in CATEGORIES}
         uncategorized = []
         
-        for url, content in self.scraped_content.items():
-            categorized = False
-            url_lower = url.lower()
-            title_lower = content['title'].lower()
-            
-            for category, keywords in categories.items():
-                if any(keyword in url_lower or keyword in title_lower for keyword in keywords):
-                    categorized_content[category].append(content)
-                    categorized = True
-                    break
-            
-            if not categorized:
+        # Pages were classified as they were scraped
+        for content in self.scraped_content.values():
+            if content['category']:
+                categorized_content[content['category']].append(content)
+            else:
                 uncategorized.append(content)
         
+        # Shared by every file's header
+        last_updated = f"**Last Updated:** {datetime.now().strftime('%B %d, %Y')}\n\n{_PAGE_SEPARATOR}"
+        
         # Write category files
         for category, contents in categorized_content.items():
             if contents:
                 filename = f"Tech_Close_{category}.md"
-                file_content = f"# Close.com {category.replace('_', ' ')} Documentation\n\n"
-                file_content += f"**Purpose:** Close.com {category.replace('_', ' ')} reference documentation\n\n"
-                file_content += f"**Last Updated:** {datetime.now().strftime('%B %d, %Y')}\n\n"
-                file_content += "---\n\n"
-                
-                for content in contents:
-                    file_content += f"## {content['title']}\n\n"
-                    file_content += f"**URL:** {content['url']}\n\n"
-                    file_content += f"{content['content']}\n\n"
-                    
-                    if content['code_examples']:
-                        file_content += "### Code Examples\n\n"
-                        for code in content['code_examples']:
-                            file_content += f"```{code.get('language', '')}\n"
-                            file_content += f"{code['content']}\n"
-                            file_content += "```\n\n"
-                    
-                    file_content += "---\n\n"
-                
-                files[filename] = file_content
+                header = (
+                    f"# Close.com {category.replace('_', ' ')} Documentation\n\n"
+                    f"**Purpose:** Close.com {category.replace('_', ' ')} reference documentation\n\n"
+                    f"{last_updated}"
+                )
+                files[filename] = ''.join(chain((header,), _iter_page_chunks(contents)))
         
         # Write uncategorized content
         if uncategorized:
             filename = "Tech_Close_Additional.md"
-            file_content = "# Close.com Additional Documentation\n\n"
-            file_content += "**Purpose:** Additional Close.com documentation and references\n\n"
-            file_content += f"**Last Updated:** {datetime.now().strftime('%B %d, %Y')}\n\n"
-            file_content += "---\n\n"
-            
-            for content in uncategorized:
-                file_content += f"## {content['title']}\n\n"
-                file_content += f"**URL:** {content['url']}\n\n"
-                file_content += f"{content['content']}\n\n"
-                
-                if content['code_examples']:
-                    file_content += "### Code Examples\n\n"
-                    for code in content['code_examples']:
-                        file_content += f"```{code.get('language', '')}\n"
-                        file_content += f"{code['content']}\n"
-                        file_content += "```\n\n"
-                
-                file_content += "---\n\n"
-            
-            files[filename] = file_content
+            header = (
+                "# Close.com Additional Documentation\n\n"
+                "**Purpose:** Additional Close.com documentation and references\n\n"
+                f"{last_updated}"
+            )
+            files[filename] = ''.join(chain((header,), _iter_page_chunks(uncategorized)))
         
         # Create master index
         filename = "Tech_Close_Master_Index.md"
-        file_content = "# Close.com Complete Documentation Index\n\n"
-        file_content += "**Purpose:** Master index of all Close.com developer documentation\n\n"
-        file_content += f"**Total Pages Scraped:** {len(self.scraped_content)}\n\n"
-        file_content += f"**Last Updated:** {datetime.now().strftime('%B %d, %Y')}\n\n"
-        file_content += "---\n\n"
-        
-        file_content += "## Documentation Structure\n\n"
-        file_content += "This documentation has been organized into the following files:\n\n"
+        parts = [
+            "# Close.com Complete Documentation Index\n\n",
+            "**Purpose:** Master index of all Close.com developer documentation\n\n",
+            f"**Total Pages Scraped:** {len(self.scraped_content)}\n\n",
+            f"**Last Updated:** {datetime.now().strftime('%B %d, %Y')}\n\n",
+            "---\n\n",
+            "## Documentation Structure\n\n",
+            "This documentation has been organized into the following files:\n\n"
+        ]
         
         for file_name in files.keys():
             if file_name != "Tech_Close_Master_Index.md":
-                file_content += f"- **{file_name}**\n"
+                parts.append(f"- **{file_name}**\n")
         
-        file_content += "\n## Complete Page Index\n\n"
+        parts.append("\n## Complete Page Index\n\n")
         
         sorted_pages = sorted(self.scraped_content.items(), key=lambda x: x[1]['title'])
         for url, content in sorted_pages:
-            file_content += f"- **{content['title']}** - {url}\n"
+            parts.append(f"- **{content['title']}** - {url}\n")
+        
+        if self.duplicate_urls:
+            parts.append("\n## Duplicate Pages\n\n")
+            parts.append("These URLs served the same content as another page and were not stored separately:\n\n")
+            for url, canonical_url in sorted(self.duplicate_urls.items()):
+                parts.append(f"- {url} → {canonical_url}\n")
         
-        files[filename] = file_content
+        files[filename] = ''.join(parts)
         
         # Add JSON backup
-        files["complete_documentation.json"] = json.dumps(self.scraped_content, indent=2, ensure_ascii=False)
+        # Serialized straight to UTF-8 bytes; the ZIP and download button take bytes as-is
+        files["complete_documentation.json"] = orjson.dumps(
+            self.scraped_content, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        )
         
         return files
 
+async def fetch_page(url):
+    """Fetch a single page, returning its status code, final URL, body and cache flag"""
+    scraper = CloseDocScraper()
+    # Bypass the HTTP cache so the check really reaches the server
+    async with scraper.create_session(cached=False) as scraper.session:
+        return await scraper.fetch(url)
+
+async def clear_http_cache():
+    """Drop every response stored in the on-disk HTTP cache"""
+    if CachedSession is None:
+        return
+    
+    cache = SQLiteBackend(cache_name=HTTP_CACHE_NAME)
+    try:
+        await cache.clear()
+    finally:
+        await cache.close()
+
 def create_zip_download(files_dict):
     """Create a ZIP file from the files dictionary"""
     zip_buffer = BytesIO()
     
+    # Every entry shares one timestamp instead of the moment it happened to be written
+    date_time = datetime.now().timetuple()[:6]
+    
     with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
         for filename, content in files_dict.items():
-            zip_file.writestr(filename, content)
+            zinfo = zipfile.ZipInfo(filename, date_time=date_time)
+            zinfo.external_attr = 0o644 << 16
+            # The JSON backup is the largest entry and only a scratch copy, so favour speed
+            compresslevel = ZIP_JSON_COMPRESSLEVEL if filename.endswith('.json') else ZIP_COMPRESSLEVEL
+            zip_file.writestr(zinfo, content, compress_type=zipfile.ZIP_DEFLATED, compresslevel=compresslevel)
     
     zip_buffer.seek(0)
     return zip_buffer
@@ -292,6 +603,7 @@ def main():
             # Clear all session state
             for key in list(st.session_state.keys()):
                 del st.session_state[key]
+            asyncio.run(clear_http_cache())
             st.rerun()
     
     st.markdown("""
@@ -323,22 +635,18 @@ def main():
         if st.button("Test Starting URL"):
             with st.spinner("Testing URL accessibility..."):
                 try:
-                    test_session = requests.Session()
-                    test_session.headers.update({
-                        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                    })
-                    
-                    response = test_session.get(start_url, timeout=10)
-                    soup = BeautifulSoup(response.content, 'html.parser')
+                    status, final_url, body, _ = asyncio.run(fetch_page(start_url))
+                    if body is None:
+                        raise ValueError("response is not HTML or exceeds the page size limit")
+                    tree = LexborHTMLParser(body)
                     
                     # Find all links
-                    all_links = [urljoin(start_url, link.get('href', '')) for link in soup.find_all('a', href=True)]
+                    all_links = [_canonicalize(urljoin(final_url, link.attributes['href'] or '')) for link in tree.css('a[href]')]
                     
                     # Test URL filter
-                    scraper_test = CloseDocScraper()
-                    doc_links = [link for link in all_links if scraper_test.is_documentation_url(link)]
+                    doc_links = [link for link in all_links if CloseDocScraper.is_documentation_url(link)]
                     
-                    st.success(f"✅ URL accessible! Status: {response.status_code}")
+                    st.success(f"✅ URL accessible! Status: {status}")
                     st.info(f"Found {len(all_links)} total links")
                     st.info(f"Found {len(doc_links)} documentation links")
                     
@@ -362,7 +670,7 @@ def main():
     # Warning about rate limiting
     st.warning("""
     ⚠️ **Important Notes:**
-    - This scraper is respectful (0.5s delays between requests)
+    - This scraper is respectful (at most 8 parallel requests, each worker pausing 0.5s between pages)
     - It may take 10-20 minutes to complete
     - Large documentation sites can result in many files
     - The scraper will stop and organize results if interrupted
@@ -387,7 +695,7 @@ def main():
         
         # Start scraping
         try:
-            scraper.crawl_documentation(start_url, progress_container)
+            asyncio.run(scraper.crawl_documentation(start_url, progress_container))
             
             st.success(f"✅ Scraping complete! Found {len(scraper.scraped_content)} pages")
             
@@ -409,7 +717,10 @@ def main():
                 st.metric("Generated Files", len(organized_files))
             
             with col3:
-                total_size = sum(len(content.encode('utf-8')) for content in organized_files.values())
+                total_size = sum(
+                    len(content) if isinstance(content, bytes) else len(content.encode('utf-8'))
+                    for content in organized_files.values()
+                )
                 st.metric("Total Size", f"{total_size / 1024 / 1024:.1f} MB")
             
             # File download section
@@ -459,7 +770,7 @@ def main():
             
             if selected_file:
                 if selected_file.endswith('.json'):
-                    st.json(json.loads(organized_files[selected_file])[:3])  # Show first 3 entries
+                    st.json(dict(islice(scraper.scraped_content.items(), 3)))  # Show first 3 entries
                 else:
                     preview_content = organized_files[selected_file][:2000]  # First 2000 chars
                     st.text_area(
@@ -497,7 +808,7 @@ def main():
     st.subheader("ℹ️ About This Tool")
     st.markdown("""
     This scraper follows best practices:
-    - **Respectful**: 0.5-second delays between requests
+    - **Respectful**: Limited parallelism with 0.5-second delays per worker
     - **Smart**: Only scrapes documentation pages
     - **Organized**: Categorizes content logically
     - **Complete**: Captures text, code examples, and structure